@@ -0,0 +1,1082 @@
+#!/usr/bin/env python3
+"""
+智译平台积分系统管理脚本基准测试
+在本地 Postgres 中生成可配置规模的数据集，并对 PointsManager 的各项操作计时
+
+使用方法：
+python scripts/admin_bench.py seed --users 1000000 --ledger 50000000
+python scripts/admin_bench.py run --output bench.json --compare baseline.json
+python scripts/admin_bench.py coldstart --budget-ms 300
+python scripts/admin_bench.py loadtest --workers 16 --duration 60 --mix consume=60,checkin=15,redeem=15,admin_adjust=8,admin_infinite=2
+"""
+
+import psycopg2
+import psycopg2.extensions
+import sys
+import os
+import json
+import math
+import time
+import random
+import argparse
+import subprocess
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Dict, Any
+
+from admin_script import (DAEMON_SOCKET, DATABASE_URL, LEDGER_MIRROR_TYPES, MEMBERSHIP_TYPES, PAGE_SIZE,
+                          PointsManager, QueryTracer, UserCache)
+
+# 种子数据的 user_id 与兑换码前缀，用于识别和清理基准数据
+BENCH_PREFIX = "bench_"
+
+# 种子数据的时间跨度 (天)
+SEED_HISTORY_DAYS = 365
+
+# COPY 时每个文本块包含的行数
+SEED_CHUNK_ROWS = 10000
+
+# 流水类型分布：(类型, 权重, 最小金额, 最大金额)，整体期望为正，少数透支的用户最后补一条修正记录
+SEED_LEDGER_MIX = [
+    ('CHECKIN', 40, 10, 10),
+    ('CONSUME', 35, -50, -5),
+    ('REFUND', 10, 5, 50),
+    ('EARN', 10, 50, 500),
+    ('ADMIN_EARN', 5, 100, 100),
+]
+
+# 计时前的预热次数，以及重型操作 (全量列出、批量生成) 的默认计时次数
+BENCH_WARMUP = 5
+BENCH_ITERATIONS = 200
+BENCH_HEAVY_ITERATIONS = 10
+
+# 每次批量生成兑换码的数量
+BENCH_BULK_CODES = 1000
+
+# 积分调整用例写入的交易说明，运行结束后按它撤销调整并删除流水
+BENCH_ADJUST_DESCRIPTION = "bench 调整"
+
+# 对比基线时，低于该毫秒数的变化视为噪声
+BENCH_MIN_DELTA_MS = 1.0
+
+# 冷启动测量：每种方式的运行次数、直接调用 (解释器启动 + 导入 + 建立连接 + 一次查询) 的 p50 预算
+COLD_START_RUNS = 20
+COLD_START_BUDGET_MS = 300
+COLD_START_COMMAND = ['list-users', '--limit', '1']
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 压力测试：默认操作比例、时长、热点用户数 (越少争用越激烈)、兑换码数量与每个码的使用上限
+LOAD_MIX = {'consume': 60, 'checkin': 15, 'redeem': 15, 'admin_adjust': 8, 'admin_infinite': 2}
+LOAD_DURATION = 30
+LOAD_HOT_USERS = 50
+LOAD_CODES = 20
+LOAD_CODE_MAX_USES = 25
+
+# 压力测试期间采样 pg_stat_activity 锁等待的间隔 (秒)
+LOAD_SAMPLE_INTERVAL = 0.1
+
+# 签到日期在最近这么多天内随机选取，避免 (user_id, checkin_date) 唯一约束让热点用户的签到几乎全部被拒
+LOAD_CHECKIN_DAYS = 3650
+
+# 只有热点用户中的这一部分会被切换无限积分，账本核对时跳过它们
+# (网页端对无限积分用户的扣费只记流水不改余额，切换过的用户余额与账本本来就不相等)
+LOAD_INFINITE_SHARE = 0.1
+
+
+class ChunkReader:
+    """把文本块生成器包装成 copy_expert 可读取的文件对象，内存占用与块大小相当"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def is_local_dsn(dsn: str) -> bool:
+    """判断连接串是否指向本机 (TCP 回环地址或 Unix 套接字)"""
+    host = psycopg2.extensions.parse_dsn(dsn).get('host', '')
+    return host in ('', 'localhost', '127.0.0.1', '::1') or host.startswith('/')
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """最近秩法百分位数"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchSeeder:
+    """用 COPY 批量生成基准数据集
+
+    用户、流水、签到、兑换码均以 BENCH_PREFIX 为前缀，可与真实数据共存并按前缀清理。
+    流水写入后按合计回填 users.points，保证余额与账本一致 (reconcile 可直接核对)。
+    """
+
+    def __init__(self, conn, prefix: str = BENCH_PREFIX, seed: int = 42):
+        self.conn = conn
+        self.prefix = prefix
+        self.code_prefix = prefix.rstrip('_').upper()
+        self.rng = random.Random(seed)
+        self.now = datetime.now().replace(microsecond=0)
+        self.history_start = self.now - timedelta(days=SEED_HISTORY_DAYS)
+
+    def user_id(self, index: int) -> str:
+        return f"{self.prefix}{index:08d}"
+
+    def user_created_at(self, index: int, users: int) -> datetime:
+        # 注册时间随序号单调递增，与 id 顺序一致
+        return self.history_start + timedelta(seconds=SEED_HISTORY_DAYS * 86400 * index // max(users, 1))
+
+    def existing_rows(self) -> int:
+        with self.conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM users WHERE starts_with(user_id, %s)", (self.prefix,))
+            return cursor.fetchone()[0]
+
+    def reset(self):
+        """删除基准数据 (流水和签到随用户级联删除)"""
+        with self.conn.cursor() as cursor:
+            cursor.execute("DELETE FROM users WHERE starts_with(user_id, %s)", (self.prefix,))
+            users = cursor.rowcount
+            cursor.execute("DELETE FROM redeem_codes WHERE starts_with(code, %s)", (self.code_prefix,))
+            codes = cursor.rowcount
+        self.conn.commit()
+        print(f"🗑️ 已清理基准数据: {users} 个用户，{codes} 个兑换码")
+
+    def _copy(self, table: str, columns: List[str], rows, total: int):
+        started = time.perf_counter()
+
+        def chunks():
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= SEED_CHUNK_ROWS:
+                    yield '\n'.join(batch) + '\n'
+                    batch = []
+            if batch:
+                yield '\n'.join(batch) + '\n'
+
+        with self.conn.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", ChunkReader(chunks()), size=1 << 20)
+        self.conn.commit()
+
+        elapsed = time.perf_counter() - started
+        print(f"   ✅ {table}: {total:,} 行，耗时 {elapsed:.1f}秒 (约 {total / max(elapsed, 1e-9):,.0f} 行/秒)")
+
+    def _user_rows(self, users: int):
+        rng = self.rng
+        today = self.now.date()
+        for i in range(users):
+            created = self.user_created_at(i, users).isoformat(sep=' ')
+            infinite = 't' if rng.random() < 0.01 else 'f'
+            membership = rng.choices(MEMBERSHIP_TYPES, weights=(80, 10, 7, 3))[0]
+            expiry = '\\N' if membership == 'free' else (today + timedelta(days=rng.randint(-30, 360))).isoformat()
+            yield f"{self.user_id(i)}\t{self.user_id(i)}@bench.local\t0\t{infinite}\t{membership}\t{expiry}\t{created}\t{created}"
+
+    def _ledger_rows(self, users: int, ledger: int):
+        rng = self.rng
+        types = [item[0] for item in SEED_LEDGER_MIX]
+        weights = [item[1] for item in SEED_LEDGER_MIX]
+        ranges = {item[0]: (item[2], item[3]) for item in SEED_LEDGER_MIX}
+
+        # 每个用户一条注册赠送记录，与网页端初始化用户一致
+        for i in range(min(users, ledger)):
+            created = self.user_created_at(i, users).isoformat(sep=' ')
+            yield f"{self.user_id(i)}\t100\tINITIAL\t新用户注册赠送积分\t{created}"
+
+        for _ in range(ledger - min(users, ledger)):
+            # 平方分布让少数早期用户产生大部分流水
+            i = int(users * rng.random() ** 2)
+            tx_type = rng.choices(types, weights)[0]
+            low, high = ranges[tx_type]
+            amount = rng.randint(min(low, high), max(low, high))
+            user_created = self.user_created_at(i, users)
+            created = user_created + (self.now - user_created) * rng.random()
+            yield f"{self.user_id(i)}\t{amount}\t{tx_type}\tbench {tx_type.lower()}\t{created.isoformat(sep=' ', timespec='seconds')}"
+
+    def _checkin_rows(self, users: int, checkins: int):
+        today = self.now.date()
+        for n in range(checkins):
+            # 第 n 条签到属于用户 n % users 的倒数第 n // users 天，保证 (user_id, checkin_date) 唯一
+            i, day = n % users, n // users
+            checkin_date = today - timedelta(days=day)
+            yield f"{self.user_id(i)}\t{checkin_date.isoformat()}\t10\t{checkin_date.isoformat()} 08:00:00"
+
+    def _code_rows(self, codes: int):
+        rng = self.rng
+        for n in range(codes):
+            created = self.history_start + (self.now - self.history_start) * (n / max(codes, 1))
+            max_uses = rng.choice(['1', '1', '1', '5', '\\N'])
+            current_uses = '0' if max_uses == '\\N' else str(rng.randint(0, int(max_uses)))
+            active = 't' if rng.random() < 0.9 else 'f'
+            expires = '\\N' if rng.random() < 0.7 else (created + timedelta(days=rng.randint(7, 180))).isoformat(sep=' ', timespec='seconds')
+            yield (f"{self.code_prefix}{n:010d}\t{rng.choice((10, 50, 100, 500))}\t{max_uses}\t{current_uses}\t"
+                   f"{active}\t{expires}\t{created.isoformat(sep=' ', timespec='seconds')}")
+
+    def _settle_balances(self):
+        """按账本合计回填余额；合计为负的用户补一条修正记录后余额置 0"""
+        with self.conn.cursor() as cursor:
+            cursor.execute("""
+                WITH sums AS (
+                    SELECT user_id, SUM(amount)::integer AS total
+                    FROM point_transactions
+                    WHERE starts_with(user_id, %(prefix)s)
+                    GROUP BY user_id
+                ),
+                corrections AS (
+                    INSERT INTO point_transactions (user_id, amount, transaction_type, description, created_at)
+                    SELECT user_id, -total, 'ADMIN_EARN', 'bench 余额修正', %(now)s
+                    FROM sums WHERE total < 0
+                )
+                UPDATE users u
+                SET points = GREATEST(s.total, 0)
+                FROM sums s
+                WHERE u.user_id = s.user_id
+            """, {'prefix': self.prefix, 'now': self.now})
+        self.conn.commit()
+
+    def seed(self, users: int, ledger: int, checkins: int, codes: int):
+        print(f"\n🌱 生成基准数据集: {users:,} 用户，{ledger:,} 流水，{checkins:,} 签到，{codes:,} 兑换码")
+        started = time.perf_counter()
+
+        self._copy('users', ['user_id', 'email', 'points', 'has_infinite_points', 'membership_type',
+                             'membership_expiry', 'created_at', 'updated_at'],
+                   self._user_rows(users), users)
+        if users:
+            self._copy('point_transactions', ['user_id', 'amount', 'transaction_type', 'description', 'created_at'],
+                       self._ledger_rows(users, ledger), ledger)
+            self._copy('user_checkins', ['user_id', 'checkin_date', 'points_earned', 'created_at'],
+                       self._checkin_rows(users, checkins), checkins)
+        self._copy('redeem_codes', ['code', 'points_value', 'max_uses', 'current_uses', 'is_active',
+                                    'expires_at', 'created_at'],
+                   self._code_rows(codes), codes)
+
+        print("   ⏳ 按账本回填余额...")
+        self._settle_balances()
+
+        self.conn.autocommit = True
+        with self.conn.cursor() as cursor:
+            for table in ('users', 'point_transactions', 'user_checkins', 'redeem_codes'):
+                cursor.execute(f"ANALYZE {table}")
+        self.conn.autocommit = False
+
+        print(f"\n✅ 数据集生成完成，总耗时 {time.perf_counter() - started:.1f}秒")
+
+
+class BenchContext:
+    """计时用例共享的状态：随机样本用户和自增的兑换码序号"""
+
+    def __init__(self, users: List[str], code_prefix: str, seed: int = 42):
+        self.users = users
+        self.code_prefix = code_prefix
+        self.rng = random.Random(seed)
+        self.run_id = datetime.now().strftime('%H%M%S')
+        self._code_seq = 0
+
+    def pick_user(self) -> str:
+        return self.rng.choice(self.users)
+
+    def next_code(self) -> str:
+        self._code_seq += 1
+        return f"{self.code_prefix}R{self.run_id}{self._code_seq:06d}"
+
+
+# (用例名, 调用, 是否重型)；返回 False 计为失败
+BENCH_CASES = [
+    ('list_users', lambda m, ctx: m.list_users(PAGE_SIZE), False),
+    ('get_user_details', lambda m, ctx: m.get_user_details(ctx.pick_user()), False),
+    ('modify_user_points', lambda m, ctx: m.modify_user_points(ctx.pick_user(), 1, BENCH_ADJUST_DESCRIPTION), False),
+    ('create_redeem_code', lambda m, ctx: m.create_redeem_code(10, custom_code=ctx.next_code()), False),
+    ('bulk_create_redeem_codes', lambda m, ctx: m.bulk_create_redeem_codes(BENCH_BULK_CODES, 10) > 0, True),
+    ('list_redeem_codes', lambda m, ctx: m.list_redeem_codes(), True),
+]
+
+
+def sample_users(manager: PointsManager, count: int, prefix: str = BENCH_PREFIX) -> List[str]:
+    """随机选取基准数据中的用户，写操作用例只会修改这些用户"""
+    with manager.conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT user_id FROM users
+            WHERE starts_with(user_id, %s) AND NOT COALESCE(has_infinite_points, false)
+            ORDER BY random() LIMIT %s
+        """, (prefix, count))
+        return [row[0] for row in cursor.fetchall()]
+
+
+def dataset_sizes(manager: PointsManager) -> Dict[str, int]:
+    """各表的估算行数 (pg_class.reltuples，避免在大表上 COUNT(*))"""
+    with manager.conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT relname, reltuples::bigint FROM pg_class
+            WHERE relname IN ('users', 'point_transactions', 'user_checkins', 'redeem_codes')
+              AND relkind = 'r'
+        """)
+        return {name: rows for name, rows in cursor.fetchall()}
+
+
+def run_case(manager: PointsManager, ctx: BenchContext, call, iterations: int, warmup: int) -> Dict[str, Any]:
+    durations = []
+    round_trips = []
+    failures = 0
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for i in range(warmup + iterations):
+            before = manager.tracer.round_trips
+            started = time.perf_counter()
+            result = call(manager, ctx)
+            elapsed = (time.perf_counter() - started) * 1000
+            if i < warmup:
+                continue
+            durations.append(elapsed)
+            round_trips.append(manager.tracer.round_trips - before)
+            if result is False:
+                failures += 1
+
+    durations.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(durations, 50), 3),
+        'p99_ms': round(percentile(durations, 99), 3),
+        'mean_ms': round(sum(durations) / len(durations), 3) if durations else 0.0,
+        'max_ms': round(durations[-1], 3) if durations else 0.0,
+        'round_trips': round(sum(round_trips) / len(round_trips), 2) if round_trips else 0.0,
+        'failures': failures,
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+                    min_delta_ms: float = BENCH_MIN_DELTA_MS) -> List[str]:
+    """与基线对比，返回回归描述列表
+
+    延迟超过基线 (1 + tolerance) 倍且绝对差值大于 min_delta_ms 视为回归；
+    往返次数是确定值，任何增加都视为回归。
+    """
+    regressions = []
+    print(f"\n📈 与基线对比 (基线提交: {baseline.get('git_commit') or '未知'}):")
+    print(f"{'用例':<26} {'p50':>20} {'p99':>20} {'往返':>12}")
+    print("-" * 82)
+
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            print(f"{name:<26} {'(基线中无此用例)':>20}")
+            continue
+
+        cells = []
+        for key in ('p50_ms', 'p99_ms'):
+            old, new = base[key], result[key]
+            change = (new - old) / old * 100 if old else 0.0
+            cells.append(f"{old:.1f}→{new:.1f} ({change:+.0f}%)")
+            if new > old * (1 + tolerance) and new - old > min_delta_ms:
+                regressions.append(f"{name} {key[:-3]} {old:.1f}ms → {new:.1f}ms ({change:+.0f}%)")
+
+        if result['round_trips'] > base['round_trips']:
+            regressions.append(f"{name} 往返次数 {base['round_trips']} → {result['round_trips']}")
+        print(f"{name:<26} {cells[0]:>20} {cells[1]:>20} {base['round_trips']:>5}→{result['round_trips']:<5}")
+
+    return regressions
+
+
+def cmd_seed(args) -> int:
+    if not is_local_dsn(DATABASE_URL) and not args.allow_remote:
+        print("❌ DATABASE_URL 不是本机数据库，拒绝写入基准数据 (确需写入请加 --allow-remote)")
+        return 1
+
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+    except psycopg2.Error as e:
+        print(f"❌ 数据库连接失败: {e}")
+        return 1
+
+    try:
+        seeder = BenchSeeder(conn, args.prefix, args.seed)
+        existing = seeder.existing_rows()
+        if existing and not args.reset:
+            print(f"❌ 已存在 {existing} 个前缀为 '{args.prefix}' 的用户，请加 --reset 先清理")
+            return 1
+        if args.reset:
+            seeder.reset()
+        seeder.seed(args.users, args.ledger, args.checkins, args.codes)
+        return 0
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"❌ 生成基准数据失败: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+def cmd_run(args) -> int:
+    if not is_local_dsn(DATABASE_URL) and not args.allow_remote:
+        print("❌ DATABASE_URL 不是本机数据库，基准测试会写入数据，拒绝执行 (确需执行请加 --allow-remote)")
+        return 1
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ 无法读取基线文件: {e}")
+            return 1
+
+    # 往返次数取自查询追踪器 (语句、服务端游标 FETCH、事务提交/回滚)
+    manager = PointsManager(tracer=QueryTracer())
+    if not args.with_cache:
+        # 默认关闭用户缓存，测量的是数据库路径
+        manager.user_cache = UserCache(max_size=0)
+
+    try:
+        users = sample_users(manager, 1000, args.prefix)
+        if not users:
+            print(f"❌ 没有前缀为 '{args.prefix}' 的用户，请先执行 seed")
+            return 1
+
+        with manager.conn.cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM redeem_codes")
+            codes_watermark = cursor.fetchone()[0]
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM point_transactions")
+            ledger_watermark = cursor.fetchone()[0]
+            cursor.execute("SHOW server_version")
+            server_version = cursor.fetchone()[0]
+
+        report = {
+            'version': 1,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'postgres': server_version,
+            'dataset': dataset_sizes(manager),
+            'user_cache': args.with_cache,
+            'results': {},
+        }
+
+        ctx = BenchContext(users, args.prefix.rstrip('_').upper(), args.seed)
+        selected = set(args.cases) if args.cases else None
+
+        print(f"\n⏱️ 基准测试 (数据集: {', '.join(f'{k} {v:,}' for k, v in sorted(report['dataset'].items()))})")
+        print(f"{'用例':<26} {'次数':>6} {'p50(ms)':>10} {'p99(ms)':>10} {'均值(ms)':>10} {'往返':>6} {'失败':>6}")
+        print("-" * 80)
+
+        try:
+            for name, call, heavy in BENCH_CASES:
+                if selected and name not in selected:
+                    continue
+                iterations = args.heavy_iterations if heavy else args.iterations
+                warmup = min(args.warmup, 1) if heavy else args.warmup
+                result = run_case(manager, ctx, call, iterations, warmup)
+                report['results'][name] = result
+                print(f"{name:<26} {iterations:>6} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} "
+                      f"{result['mean_ms']:>10.2f} {result['round_trips']:>6} {result['failures']:>6}")
+        finally:
+            # 清理本次创建的兑换码，避免后续运行的列表规模逐次膨胀；
+            # 撤销积分调整用例的余额变更并删除其流水，余额与账本保持一致
+            with manager.conn.cursor() as cursor:
+                cursor.execute("DELETE FROM redeem_codes WHERE id > %s", (codes_watermark,))
+                cursor.execute("""
+                    WITH removed AS (
+                        DELETE FROM point_transactions
+                        WHERE id > %s AND starts_with(user_id, %s) AND description = %s
+                        RETURNING user_id, amount
+                    )
+                    UPDATE users u
+                    SET points = u.points - r.total, updated_at = NOW()
+                    FROM (SELECT user_id, SUM(amount) AS total FROM removed GROUP BY user_id) r
+                    WHERE u.user_id = r.user_id
+                """, (ledger_watermark, args.prefix, BENCH_ADJUST_DESCRIPTION))
+
+    except psycopg2.Error as e:
+        print(f"❌ 基准测试失败: {e}")
+        return 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📄 结果已写入: {args.output}")
+
+    if baseline:
+        regressions = compare_results(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 发现 {len(regressions)} 项回归:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("\n✅ 未发现回归")
+
+    return 0
+
+
+def import_profile(top: int = 5) -> tuple:
+    """用 -X importtime 测量导入 admin_script 的总耗时 (毫秒) 和最耗时的模块"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import admin_script'],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+    modules = []
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.rstrip()
+        if name.strip() == 'admin_script':
+            total_ms = int(cumulative) / 1000
+        elif name.startswith('  ') and not name.startswith('    '):
+            # 只统计 admin_script 直接导入的模块
+            modules.append((int(cumulative) / 1000, name.strip()))
+    modules.sort(reverse=True)
+    return total_ms, modules[:top]
+
+
+def time_command(argv: List[str], runs: int) -> Optional[List[float]]:
+    """重复执行命令并返回排序后的耗时 (毫秒)，命令失败时返回 None"""
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(argv, cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        durations.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            print(f"❌ 命令执行失败: {' '.join(argv)}\n{result.stderr.strip()}")
+            return None
+    return sorted(durations)
+
+
+def cmd_coldstart(args) -> int:
+    total_ms, modules = import_profile()
+    print(f"\n📦 导入 admin_script: {total_ms:.1f}ms")
+    for cumulative_ms, name in modules:
+        print(f"   {cumulative_ms:>7.1f}ms  {name}")
+
+    modes = [('直接调用', [sys.executable, 'admin_script.py'] + COLD_START_COMMAND)]
+    if os.path.exists(args.socket):
+        modes.append(('守护进程', [sys.executable, 'admin_client.py', '--socket', args.socket] + COLD_START_COMMAND))
+    else:
+        print(f"ℹ️ 未发现守护进程套接字 {args.socket}，跳过守护进程模式 (先执行 admin_script.py serve)")
+
+    print(f"\n🚀 冷启动 ({' '.join(COLD_START_COMMAND)}，每种方式 {args.runs} 次):")
+    print(f"{'方式':<10} {'p50(ms)':>10} {'p99(ms)':>10} {'最短(ms)':>10}")
+    print("-" * 44)
+    direct_p50 = None
+    for label, argv in modes:
+        durations = time_command(argv, args.runs)
+        if durations is None:
+            return 1
+        p50 = percentile(durations, 50)
+        if direct_p50 is None:
+            direct_p50 = p50
+        print(f"{label:<10} {p50:>10.1f} {percentile(durations, 99):>10.1f} {durations[0]:>10.1f}")
+
+    if direct_p50 > args.budget_ms:
+        print(f"\n❌ 直接调用 p50 {direct_p50:.1f}ms 超出预算 {args.budget_ms:g}ms")
+        return 1
+    print(f"\n✅ 直接调用 p50 在预算 {args.budget_ms:g}ms 之内")
+    return 0
+
+
+def web_update_points(cursor, user_id: str, change: int, description: str) -> bool:
+    """逐语句复刻网页端 updateUserPoints：先读余额，再把读到的值加上变动写回，没有事务和行锁"""
+    cursor.execute("SELECT points, has_infinite_points FROM users WHERE user_id = %s", (user_id,))
+    row = cursor.fetchone()
+    if not row:
+        return False
+    points, infinite = row
+    transaction_type = "EARN" if change > 0 else "CONSUME"
+    if not (infinite and change < 0):
+        if change < 0 and points + change < 0:
+            return False
+        cursor.execute("UPDATE users SET points = %s, updated_at = NOW() WHERE user_id = %s",
+                       (points + change, user_id))
+    cursor.execute("""
+        INSERT INTO point_transactions (user_id, amount, transaction_type, description)
+        VALUES (%s, %s, %s, %s)
+    """, (user_id, change, transaction_type, description))
+    return True
+
+
+def web_consume(cursor, user_id: str, amount: int) -> bool:
+    return web_update_points(cursor, user_id, -amount, "loadtest 任务消费")
+
+
+def web_checkin(cursor, user_id: str, checkin_date: date) -> bool:
+    """复刻 dailyCheckin：检查当天是否已签到、写入签到记录、再通过 updateUserPoints 加积分"""
+    cursor.execute("SELECT 1 FROM user_checkins WHERE user_id = %s AND checkin_date = %s", (user_id, checkin_date))
+    if cursor.fetchone():
+        return False
+    cursor.execute("INSERT INTO user_checkins (user_id, checkin_date, points_earned) VALUES (%s, %s, 10)",
+                   (user_id, checkin_date))
+    return web_update_points(cursor, user_id, 10, "每日签到奖励")
+
+
+def web_redeem(cursor, user_id: str, code: str) -> bool:
+    """复刻 redeemCode：逐项检查后写 REDEEM 流水、通过 updateUserPoints 写 EARN 流水，最后按读到的值回写使用次数"""
+    cursor.execute("""
+        SELECT id, points_value, max_uses, current_uses, is_active, expires_at
+        FROM redeem_codes WHERE code = %s
+    """, (code,))
+    row = cursor.fetchone()
+    if not row:
+        return False
+    code_id, points_value, max_uses, current_uses, is_active, expires_at = row
+    if not is_active or (expires_at and expires_at < datetime.now()) or (max_uses and current_uses >= max_uses):
+        return False
+
+    cursor.execute("""
+        SELECT 1 FROM point_transactions
+        WHERE redeem_code_id = %s AND user_id = %s AND transaction_type = 'REDEEM' LIMIT 1
+    """, (code_id, user_id))
+    if cursor.fetchone():
+        return False
+
+    cursor.execute("""
+        INSERT INTO point_transactions (user_id, redeem_code_id, amount, transaction_type, description)
+        VALUES (%s, %s, %s, 'REDEEM', %s)
+    """, (user_id, code_id, points_value, f"兑换码兑换 - {code}"))
+    if not web_update_points(cursor, user_id, points_value, f"兑换码兑换 - {code}"):
+        return False
+    cursor.execute("UPDATE redeem_codes SET current_uses = %s WHERE id = %s", (current_uses + 1, code_id))
+    return True
+
+
+# 单语句版本：同样的业务规则，余额和使用次数在数据库端原子地累加，用于对比网页端现有写法
+ATOMIC_CONSUME_SQL = """
+    WITH updated AS (
+        UPDATE users
+        SET points = CASE WHEN has_infinite_points THEN points ELSE points - %(amount)s END, updated_at = NOW()
+        WHERE user_id = %(user_id)s AND (has_infinite_points OR points >= %(amount)s)
+        RETURNING user_id
+    )
+    INSERT INTO point_transactions (user_id, amount, transaction_type, description)
+    SELECT user_id, -%(amount)s, 'CONSUME', 'loadtest 任务消费' FROM updated
+    RETURNING id
+"""
+
+ATOMIC_CHECKIN_SQL = """
+    WITH checkin AS (
+        INSERT INTO user_checkins (user_id, checkin_date, points_earned)
+        VALUES (%(user_id)s, %(checkin_date)s, 10)
+        ON CONFLICT (user_id, checkin_date) DO NOTHING
+        RETURNING user_id, points_earned
+    ), updated AS (
+        UPDATE users u
+        SET points = u.points + c.points_earned, updated_at = NOW()
+        FROM checkin c
+        WHERE u.user_id = c.user_id
+        RETURNING u.user_id, c.points_earned
+    )
+    INSERT INTO point_transactions (user_id, amount, transaction_type, description)
+    SELECT user_id, points_earned, 'EARN', '每日签到奖励' FROM updated
+    RETURNING id
+"""
+
+ATOMIC_REDEEM_SQL = """
+    WITH code AS (
+        UPDATE redeem_codes c
+        SET current_uses = c.current_uses + 1
+        WHERE c.code = %(code)s AND c.is_active
+          AND (c.expires_at IS NULL OR c.expires_at > NOW())
+          AND (c.max_uses IS NULL OR c.current_uses < c.max_uses)
+          AND NOT EXISTS (
+              SELECT 1 FROM point_transactions t
+              WHERE t.redeem_code_id = c.id AND t.user_id = %(user_id)s AND t.transaction_type = 'REDEEM'
+          )
+        RETURNING c.id, c.points_value
+    ), updated AS (
+        UPDATE users u
+        SET points = u.points + code.points_value, updated_at = NOW()
+        FROM code
+        WHERE u.user_id = %(user_id)s
+        RETURNING u.user_id, code.id AS code_id, code.points_value
+    )
+    INSERT INTO point_transactions (user_id, redeem_code_id, amount, transaction_type, description)
+    SELECT user_id, CASE WHEN t.type = 'REDEEM' THEN code_id END, points_value, t.type, %(description)s
+    FROM updated CROSS JOIN (VALUES ('REDEEM'), ('EARN')) AS t(type)
+    RETURNING id
+"""
+
+
+def atomic_consume(cursor, user_id: str, amount: int) -> bool:
+    cursor.execute(ATOMIC_CONSUME_SQL, {'user_id': user_id, 'amount': amount})
+    return cursor.fetchone() is not None
+
+
+def atomic_checkin(cursor, user_id: str, checkin_date: date) -> bool:
+    cursor.execute(ATOMIC_CHECKIN_SQL, {'user_id': user_id, 'checkin_date': checkin_date})
+    return cursor.fetchone() is not None
+
+
+def atomic_redeem(cursor, user_id: str, code: str) -> bool:
+    cursor.execute(ATOMIC_REDEEM_SQL, {'user_id': user_id, 'code': code, 'description': f"兑换码兑换 - {code}"})
+    return cursor.fetchone() is not None
+
+
+# 网页端写法: (扣费, 签到, 兑换)
+WEB_MODES = {
+    'current': (web_consume, web_checkin, web_redeem),
+    'atomic': (atomic_consume, atomic_checkin, atomic_redeem),
+}
+
+
+def load_worker(index: int, users: List[str], infinite_users: List[str], codes: List[str], mix: Dict[str, int],
+                web_mode: str, duration: float, start_at: float, seed: int) -> Dict[str, Any]:
+    """压力测试进程：按比例随机执行操作直到时间结束，返回每种操作的成功/拒绝/错误次数和延迟
+
+    网页端操作在独立的 autocommit 连接上执行，管理员操作直接调用 PointsManager。
+    """
+    rng = random.Random(seed * 1000 + index)
+    consume, checkin, redeem = WEB_MODES[web_mode]
+    ops = list(mix)
+    weights = [mix[op] for op in ops]
+    stats = {op: {'ok': 0, 'rejected': 0, 'errors': {}, 'latencies': []} for op in ops}
+
+    web = psycopg2.connect(DATABASE_URL)
+    web.autocommit = True
+    manager = PointsManager()
+    manager.user_cache = UserCache(max_size=0)
+    if not manager.connect():
+        raise RuntimeError("管理端数据库连接失败")
+
+    today = date.today()
+    calls = {
+        'consume': lambda c: consume(c, rng.choice(users), rng.randint(5, 50)),
+        'checkin': lambda c: checkin(c, rng.choice(users), today - timedelta(days=rng.randrange(LOAD_CHECKIN_DAYS))),
+        'redeem': lambda c: redeem(c, rng.choice(users), rng.choice(codes)),
+        'admin_adjust': lambda c: manager.modify_user_points(
+            rng.choice(users), rng.choice((-1, 1)) * rng.randint(1, 100), "loadtest 管理员调整"),
+        'admin_infinite': lambda c: manager.set_infinite_points(rng.choice(infinite_users), rng.random() < 0.5),
+    }
+
+    try:
+        time.sleep(max(0.0, start_at - time.time()))
+        deadline = time.perf_counter() + duration
+        with web.cursor() as cursor, open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            while time.perf_counter() < deadline:
+                op = rng.choices(ops, weights)[0]
+                entry = stats[op]
+                started = time.perf_counter()
+                try:
+                    ok = calls[op](cursor)
+                except psycopg2.Error as e:
+                    # 网页端遇到异常同样直接返回失败，已提交的语句不会回滚
+                    code = e.pgcode or type(e).__name__
+                    entry['errors'][code] = entry['errors'].get(code, 0) + 1
+                else:
+                    entry['ok' if ok is not False else 'rejected'] += 1
+                entry['latencies'].append((time.perf_counter() - started) * 1000)
+    finally:
+        web.close()
+        manager.pool.closeall()
+    return stats
+
+
+def sample_lock_waits(cursor) -> Dict[str, int]:
+    """当前库中正在等待锁的会话数，按等待的锁类型 (tuple、transactionid 等) 分组"""
+    cursor.execute("""
+        SELECT wait_event, COUNT(*) FROM pg_stat_activity
+        WHERE datname = current_database() AND wait_event_type = 'Lock' AND pid <> pg_backend_pid()
+        GROUP BY wait_event
+    """)
+    return dict(cursor.fetchall())
+
+
+def ledger_state(cursor, users: List[str]) -> Dict[str, tuple]:
+    """{user_id: (余额, 账本合计, 是否无限积分)}，账本合计的口径与 reconcile 相同"""
+    cursor.execute("""
+        SELECT u.user_id, u.points,
+               COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type <> ALL(%(mirror_types)s)), 0) AS ledger,
+               u.has_infinite_points
+        FROM users u
+        LEFT JOIN point_transactions t ON t.user_id = u.user_id
+        WHERE u.user_id = ANY(%(users)s)
+        GROUP BY u.user_id, u.points, u.has_infinite_points
+    """, {'mirror_types': LEDGER_MIRROR_TYPES, 'users': users})
+    return {user_id: (points, int(ledger), infinite) for user_id, points, ledger, infinite in cursor.fetchall()}
+
+
+def check_invariants(cursor, users: List[str], infinite_users: List[str], code_ids: List[int],
+                     baseline: Dict[str, tuple]) -> List[str]:
+    """压力测试后的不变量检查，返回违反项描述
+
+    余额与账本的差值应与测试前相同 (测试前已存在的差异不算在本次头上)，非无限积分用户余额不为负，
+    兑换码 current_uses 不超过 max_uses，且等于实际 REDEEM 流水条数。
+    """
+    violations = []
+    skipped = set(infinite_users)
+    for user_id, (points, ledger, infinite) in ledger_state(cursor, users).items():
+        if not infinite and points < 0:
+            violations.append(f"用户 {user_id} 余额为负: {points}")
+        if user_id in skipped or infinite:
+            continue
+        before_points, before_ledger, _ = baseline[user_id]
+        drift = (ledger - points) - (before_ledger - before_points)
+        if drift:
+            violations.append(f"用户 {user_id} 余额与账本不一致: 余额 {points}，账本 {ledger}，本次新增差额 {drift:+d}")
+
+    cursor.execute("""
+        SELECT c.code, c.max_uses, c.current_uses, COUNT(t.id) AS redemptions
+        FROM redeem_codes c
+        LEFT JOIN point_transactions t ON t.redeem_code_id = c.id AND t.transaction_type = 'REDEEM'
+        WHERE c.id = ANY(%s)
+        GROUP BY c.id
+    """, (code_ids,))
+    for code, max_uses, current_uses, redemptions in cursor.fetchall():
+        if max_uses is not None and current_uses > max_uses:
+            violations.append(f"兑换码 {code} 使用次数超限: {current_uses}/{max_uses}")
+        if max_uses is not None and redemptions > max_uses:
+            violations.append(f"兑换码 {code} 实际兑换 {redemptions} 次，超过上限 {max_uses}")
+        if redemptions != current_uses:
+            violations.append(f"兑换码 {code} 使用次数 {current_uses} 与实际兑换 {redemptions} 次不符")
+    return violations
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """解析 consume=60,checkin=15 形式的操作比例，未列出的操作不执行"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in LOAD_MIX:
+            raise argparse.ArgumentTypeError(f"未知操作: {name} (可选: {', '.join(LOAD_MIX)})")
+        try:
+            mix[name] = int(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"比例必须是整数: {item}")
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("至少需要一种比例大于 0 的操作")
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def cmd_loadtest(args) -> int:
+    from concurrent.futures import ProcessPoolExecutor, wait
+
+    if not is_local_dsn(DATABASE_URL) and not args.allow_remote:
+        print("❌ DATABASE_URL 不是本机数据库，压力测试会写入数据，拒绝执行 (确需执行请加 --allow-remote)")
+        return 1
+
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        conn.autocommit = True
+    except psycopg2.Error as e:
+        print(f"❌ 数据库连接失败: {e}")
+        return 1
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT user_id FROM users
+                WHERE starts_with(user_id, %s) AND NOT has_infinite_points
+                ORDER BY random() LIMIT %s
+            """, (args.prefix, args.users))
+            users = [row[0] for row in cursor.fetchall()]
+            if not users:
+                print(f"❌ 没有前缀为 '{args.prefix}' 的用户，请先执行 seed")
+                return 1
+            mix = args.mix or LOAD_MIX
+            infinite_users = users[:max(1, int(len(users) * LOAD_INFINITE_SHARE))] if 'admin_infinite' in mix else []
+
+            run_id = datetime.now().strftime('%m%d%H%M%S')
+            code_names = [f"{args.prefix.rstrip('_').upper()}L{run_id}{n:04d}" for n in range(args.codes)]
+            cursor.execute("""
+                INSERT INTO redeem_codes (code, points_value, max_uses, current_uses, is_active)
+                SELECT code, 10, %s, 0, true FROM unnest(%s::text[]) AS code
+                RETURNING id
+            """, (args.max_uses, code_names))
+            code_ids = [row[0] for row in cursor.fetchall()]
+            baseline = ledger_state(cursor, users)
+
+            total_weight = sum(mix.values())
+            print(f"\n🔥 压力测试: {args.workers} 个进程，{args.duration:g}秒，{len(users)} 个热点用户，"
+                  f"{len(code_names)} 个兑换码 (每个上限 {args.max_uses} 次)，网页端写法 {args.web_mode}")
+            print("   操作比例: " + ", ".join(f"{op} {weight * 100 / total_weight:.0f}%" for op, weight in mix.items()))
+
+            lock_samples = 0
+            waiting_total = 0
+            waiting_max = 0
+            samples_with_waits = 0
+            wait_events = {}
+
+            start_at = time.time() + 1.0
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                futures = [
+                    pool.submit(load_worker, i, users, infinite_users, code_names, mix, args.web_mode,
+                                args.duration, start_at, args.seed)
+                    for i in range(args.workers)
+                ]
+                time.sleep(max(0.0, start_at - time.time()))
+                started = time.perf_counter()
+                pending = futures
+                while pending:
+                    _, pending = wait(pending, timeout=LOAD_SAMPLE_INTERVAL)
+                    waits = sample_lock_waits(cursor)
+                    waiting = sum(waits.values())
+                    lock_samples += 1
+                    waiting_total += waiting
+                    waiting_max = max(waiting_max, waiting)
+                    samples_with_waits += waiting > 0
+                    for event, count in waits.items():
+                        wait_events[event] = wait_events.get(event, 0) + count
+                elapsed = time.perf_counter() - started
+                results = [future.result() for future in futures]
+
+            merged = {op: {'ok': 0, 'rejected': 0, 'errors': {}, 'latencies': []} for op in mix}
+            for stats in results:
+                for op, entry in stats.items():
+                    target = merged[op]
+                    target['ok'] += entry['ok']
+                    target['rejected'] += entry['rejected']
+                    target['latencies'].extend(entry['latencies'])
+                    for code, count in entry['errors'].items():
+                        target['errors'][code] = target['errors'].get(code, 0) + count
+
+            report = {
+                'version': 1,
+                'started_at': datetime.now().isoformat(timespec='seconds'),
+                'git_commit': git_commit(),
+                'workers': args.workers,
+                'duration_s': round(elapsed, 2),
+                'hot_users': len(users),
+                'web_mode': args.web_mode,
+                'mix': mix,
+                'operations': {},
+            }
+
+            print(f"\n{'操作':<16} {'成功':>8} {'拒绝':>8} {'错误':>6} {'吞吐(次/秒)':>12} {'p50(ms)':>10} {'p99(ms)':>10}")
+            print("-" * 76)
+            total_ops = 0
+            for op, entry in merged.items():
+                latencies = sorted(entry['latencies'])
+                errors = sum(entry['errors'].values())
+                total_ops += len(latencies)
+                result = {
+                    'ok': entry['ok'],
+                    'rejected': entry['rejected'],
+                    'errors': entry['errors'],
+                    'throughput': round(len(latencies) / elapsed, 1),
+                    'p50_ms': round(percentile(latencies, 50), 3),
+                    'p99_ms': round(percentile(latencies, 99), 3),
+                }
+                report['operations'][op] = result
+                print(f"{op:<16} {entry['ok']:>8} {entry['rejected']:>8} {errors:>6} {result['throughput']:>12.1f} "
+                      f"{result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f}")
+                for code, count in sorted(entry['errors'].items()):
+                    print(f"   ⚠️ {op} 错误 {code}: {count} 次")
+            report['throughput'] = round(total_ops / elapsed, 1)
+            print(f"\n⚡ 总吞吐: {report['throughput']:,.1f} 次/秒 (共 {total_ops:,} 次操作)")
+
+            report['lock_waits'] = {
+                'samples': lock_samples,
+                'samples_with_waits': samples_with_waits,
+                'mean_waiting': round(waiting_total / max(lock_samples, 1), 2),
+                'max_waiting': waiting_max,
+                'by_event': wait_events,
+            }
+            print(f"🔒 锁等待: {samples_with_waits}/{lock_samples} 次采样中有会话在等锁，"
+                  f"平均 {report['lock_waits']['mean_waiting']} 个，最多 {waiting_max} 个")
+            if wait_events:
+                print("   " + ", ".join(f"{event} {count}" for event, count in
+                                       sorted(wait_events.items(), key=lambda item: -item[1])))
+
+            violations = check_invariants(cursor, users, infinite_users, code_ids, baseline)
+            report['violations'] = violations
+
+    except psycopg2.Error as e:
+        print(f"❌ 压力测试失败: {e}")
+        return 1
+    finally:
+        conn.close()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📄 结果已写入: {args.output}")
+
+    if violations:
+        print(f"\n❌ 发现 {len(violations)} 项不变量违反:")
+        for line in violations[:args.show]:
+            print(f"   {line}")
+        if len(violations) > args.show:
+            print(f"   ... 另有 {len(violations) - args.show} 项，完整列表见 --output")
+        return 1
+    skipped = f" (跳过 {len(infinite_users)} 个切换过无限积分的用户的账本核对)" if infinite_users else ""
+    print(f"\n✅ 不变量全部成立{skipped}")
+    return 0
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="智译平台积分系统管理脚本基准测试")
+    parser.add_argument("--prefix", default=BENCH_PREFIX, help="基准数据的 user_id 前缀")
+    parser.add_argument("--seed", type=int, default=42, help="随机数种子，保证数据集和用例可复现")
+    parser.add_argument("--allow-remote", action="store_true", help="允许在非本机数据库上执行")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("seed", help="用 COPY 生成基准数据集")
+    p.add_argument("--users", type=int, default=100000, help="用户数")
+    p.add_argument("--ledger", type=int, default=5000000, help="积分流水行数 (含每个用户一条注册赠送)")
+    p.add_argument("--checkins", type=int, default=1000000, help="签到记录数")
+    p.add_argument("--codes", type=int, default=100000, help="兑换码数")
+    p.add_argument("--reset", action="store_true", help="先删除已有的基准数据")
+    p.set_defaults(handler=cmd_seed)
+
+    p = subparsers.add_parser("run", help="对 PointsManager 各项操作计时")
+    p.add_argument("--iterations", type=int, default=BENCH_ITERATIONS, help="每个用例的计时次数")
+    p.add_argument("--heavy-iterations", type=int, default=BENCH_HEAVY_ITERATIONS,
+                   help="重型用例 (全量列出兑换码、批量生成) 的计时次数")
+    p.add_argument("--warmup", type=int, default=BENCH_WARMUP, help="每个用例的预热次数")
+    p.add_argument("--case", dest="cases", action="append", choices=[case[0] for case in BENCH_CASES],
+                   help="只运行指定用例 (可重复)")
+    p.add_argument("--with-cache", action="store_true", help="保留用户缓存 (默认关闭以测量数据库路径)")
+    p.add_argument("--output", help="结果 JSON 文件")
+    p.add_argument("--compare", help="基线 JSON 文件，出现回归时退出码为 1")
+    p.add_argument("--tolerance", type=float, default=0.2, help="允许的延迟增幅 (默认 0.2 即 20%%)")
+    p.set_defaults(handler=cmd_run)
+
+    p = subparsers.add_parser("coldstart", help="测量 admin_script.py 的导入耗时和冷启动延迟")
+    p.add_argument("--runs", type=int, default=COLD_START_RUNS, help="每种方式的运行次数")
+    p.add_argument("--budget-ms", type=float, default=COLD_START_BUDGET_MS,
+                   help="直接调用的 p50 预算 (毫秒)，超出时退出码为 1")
+    p.add_argument("--socket", default=DAEMON_SOCKET, help="守护进程套接字，存在时同时测量经 admin_client.py 转发的延迟")
+    p.set_defaults(handler=cmd_coldstart)
+
+    p = subparsers.add_parser("loadtest", help="多进程并发模拟网页端扣费/签到/兑换与管理员调整，检查账本不变量")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="并发进程数 (默认 CPU 核数)")
+    p.add_argument("--duration", type=float, default=LOAD_DURATION, help=f"持续秒数 (默认 {LOAD_DURATION})")
+    p.add_argument("--users", type=int, default=LOAD_HOT_USERS, help=f"热点用户数，越少争用越激烈 (默认 {LOAD_HOT_USERS})")
+    p.add_argument("--codes", type=int, default=LOAD_CODES, help=f"本次创建的兑换码数 (默认 {LOAD_CODES})")
+    p.add_argument("--max-uses", type=int, default=LOAD_CODE_MAX_USES, help="每个兑换码的使用上限")
+    p.add_argument("--mix", type=parse_mix,
+                   help="操作比例，如 consume=60,checkin=15,redeem=15,admin_adjust=8,admin_infinite=2")
+    p.add_argument("--web-mode", choices=list(WEB_MODES), default="current",
+                   help="网页端写法: current 逐语句复刻现有代码，atomic 为单语句原子版本")
+    p.add_argument("--output", help="结果 JSON 文件")
+    p.add_argument("--show", type=int, default=20, help="最多显示的不变量违反项")
+    p.set_defaults(handler=cmd_loadtest)
+
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
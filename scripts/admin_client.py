@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+智译平台积分系统管理脚本客户端
+把命令行转发给 admin_script.py serve 守护进程执行，守护进程未运行时直接调用 admin_script.py
+
+只依赖标准库，不导入 psycopg2，适合 cron 和自动化脚本频繁调用：
+python scripts/admin_client.py user-details <用户ID>
+python scripts/admin_client.py --socket /run/zhiyi_admin.sock list-users --limit 5
+"""
+
+import os
+import sys
+import json
+import socket
+import struct
+
+# 与 admin_script.DAEMON_SOCKET 一致
+DAEMON_SOCKET = os.environ.get("ADMIN_SCRIPT_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/zhiyi_admin-{os.getuid() if hasattr(os, 'getuid') else 0}",
+    "zhiyi_admin_script.sock")
+
+ADMIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "admin_script.py")
+
+
+def peer_uid(client: socket.socket, socket_path: str) -> int:
+    """监听端进程的 uid：Linux 上用 SO_PEERCRED，其他平台取套接字文件的属主"""
+    if hasattr(socket, 'SO_PEERCRED'):
+        creds = client.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        return struct.unpack('3i', creds)[1]
+    return os.stat(socket_path).st_uid
+
+
+def forward(socket_path: str, argv) -> int:
+    """发送命令并回放守护进程的输出帧，返回命令的退出码
+
+    只把命令发给当前用户启动的守护进程，否则抛出 PermissionError。
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        owner = peer_uid(client, socket_path)
+        if owner != os.getuid():
+            raise PermissionError(f"套接字 {socket_path} 的守护进程属于 uid {owner}，不是当前用户")
+        with client.makefile('rw', encoding='utf-8', newline='\n') as stream:
+            stream.write(json.dumps({'argv': argv, 'cwd': os.getcwd()}, ensure_ascii=False) + '\n')
+            stream.flush()
+
+            for line in stream:
+                frame = json.loads(line)
+                if 'exit' in frame:
+                    return frame['exit']
+                out = sys.stderr if frame['stream'] == 'stderr' else sys.stdout
+                out.write(frame['data'])
+                out.flush()
+
+    print("❌ 守护进程连接意外中断", file=sys.stderr)
+    return 1
+
+
+def main():
+    argv = sys.argv[1:]
+    socket_path = DAEMON_SOCKET
+    if argv[:1] == ['--socket'] and len(argv) >= 2:
+        socket_path, argv = argv[1], argv[2:]
+
+    if not argv:
+        # 不带参数是交互模式，只能在本进程中运行
+        os.execv(sys.executable, [sys.executable, ADMIN_SCRIPT])
+
+    try:
+        code = forward(socket_path, argv)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # 守护进程未运行，退回到直接执行
+        os.execv(sys.executable, [sys.executable, ADMIN_SCRIPT] + argv)
+    except PermissionError as e:
+        print(f"⚠️ 不使用守护进程: {e}，改为直接执行", file=sys.stderr)
+        os.execv(sys.executable, [sys.executable, ADMIN_SCRIPT] + argv)
+    except KeyboardInterrupt:
+        code = 130
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+智译平台兑换码格式
+兑换码由可选的活动前缀、随机主体和一位校验字符组成，例如 SPRING-7KQ2M9XA2
+
+随机主体取自 os.urandom (CSPRNG)，字符集为 32 个不易混淆的字符 (排除 0/O/I/1)，
+每个随机字节的低 5 位恰好对应一个字符，没有取模偏差。校验字符使用 GF(32) 上的 Damm 算法，
+能发现主体中任意单个字符输错和任意相邻两个字符颠倒，validate_code 不需要查询数据库即可拒绝这类输入。
+活动前缀用于区分批次，可使用任意大写字母和数字，不参与校验 (校验时按期望的前缀精确匹配)。
+
+只依赖标准库，可单独使用：
+python scripts/redeem_code_format.py validate SPRING-7KQ2M9XA2 ABCD2345
+python scripts/redeem_code_format.py odds --count 1000000 --existing 200000
+"""
+
+import os
+import sys
+import math
+import argparse
+from typing import Optional, List
+
+# 兑换码字符集 (排除容易混淆的字符 0/O/I/1)，共 32 个
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+# 随机主体的默认长度 (不含前缀和校验字符)，每个字符 5 位熵
+CODE_BODY_LENGTH = 8
+
+# 活动前缀与主体之间的分隔符
+CODE_PREFIX_SEPARATOR = "-"
+
+# 活动前缀允许的字符
+CODE_PREFIX_CHARACTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+# 活动前缀的最大长度，保证完整兑换码不超过 redeem_codes.code 的 varchar(50)
+CODE_PREFIX_MAX_LENGTH = 16
+
+# 每次从 os.urandom 读取的兑换码数量，内存占用约为 数量 × 主体长度 字节
+CODE_URANDOM_BATCH = 1 << 16
+
+# 随机猜测一次命中有效兑换码的可接受概率，超过时 recommended_length 会建议更长的主体
+# (碰撞只需重新生成，真正的风险是有效兑换码在编码空间中过于密集)
+CODE_GUESS_TARGET = 1e-6
+
+_ALPHABET_SIZE = len(CODE_ALPHABET)
+_CHAR_VALUES = {char: value for value, char in enumerate(CODE_ALPHABET)}
+
+
+def _gf32_mul(a: int, b: int) -> int:
+    """GF(2^5) 乘法，本原多项式 x^5 + x^2 + 1"""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        b >>= 1
+        a <<= 1
+        if a & 0x20:
+            a ^= 0x25
+    return result
+
+
+# Damm 拟群 a∘b = α·a ⊕ b (α = x)，α ≠ 0, 1 保证全反对称：单字符错误和相邻颠倒都会改变最终状态
+_MUL_ALPHA = [_gf32_mul(value, 2) for value in range(_ALPHABET_SIZE)]
+
+# 字节 → 字符，只取低 5 位 (256 是 32 的整数倍，每个字符出现概率完全相同)
+_BYTE_TO_CHAR = bytes(ord(CODE_ALPHABET[b & 31]) for b in range(256))
+
+
+def _alpha_power(exponent: int) -> int:
+    value = 1
+    for _ in range(exponent):
+        value = _gf32_mul(value, 2)
+    return value
+
+
+def _position_table(exponent: int) -> bytes:
+    """随机字节 → 该位置对校验值的贡献 α^exponent · (字节 & 31)，供 bytes.translate 批量查表"""
+    factor = _alpha_power(exponent)
+    return bytes(_gf32_mul(b & 31, factor) for b in range(256))
+
+
+def normalize_code(code: str) -> str:
+    """去掉首尾空白并转为大写 (用户输入的兑换码先规范化再校验)"""
+    return code.strip().upper()
+
+
+def normalize_prefix(prefix: Optional[str]) -> str:
+    """规范化活动前缀 (转为大写)，长度或字符不合法时抛出 ValueError"""
+    if not prefix:
+        return ""
+    prefix = prefix.upper()
+    if len(prefix) > CODE_PREFIX_MAX_LENGTH:
+        raise ValueError(f"活动前缀最长 {CODE_PREFIX_MAX_LENGTH} 个字符: {prefix}")
+    invalid = sorted(set(prefix) - set(CODE_PREFIX_CHARACTERS))
+    if invalid:
+        raise ValueError(f"活动前缀只能使用大写字母和数字，不允许: {''.join(invalid)}")
+    return prefix
+
+
+def check_character(body: str) -> str:
+    """计算随机主体的校验字符"""
+    state = 0
+    for char in body:
+        state = _MUL_ALPHA[state] ^ _CHAR_VALUES[char]
+    # 追加的校验字符 d 需满足 α·state ⊕ d = 0
+    return CODE_ALPHABET[_MUL_ALPHA[state]]
+
+
+def split_code(code: str) -> tuple:
+    """拆分为 (前缀, 主体, 校验字符)，无前缀时前缀为空串；不检查字符集"""
+    prefix, separator, rest = code.rpartition(CODE_PREFIX_SEPARATOR)
+    if not separator:
+        rest = code
+    return prefix, rest[:-1], rest[-1:]
+
+
+def validate_code(code: str, prefix: Optional[str] = None, body_length: Optional[int] = None) -> bool:
+    """离线校验兑换码格式和校验字符，不访问数据库
+
+    prefix 指定时要求活动前缀一致 (空串表示不带前缀)；body_length 指定时要求主体长度一致。
+    传入前应先用 normalize_code 规范化。未带校验字符的旧兑换码 (8 位) 会被判为无效。
+    """
+    code_prefix, body, check = split_code(code)
+    if not body or not check:
+        return False
+    if prefix is not None and code_prefix != prefix.upper():
+        return False
+    if body_length is not None and len(body) != body_length:
+        return False
+    if len(code_prefix) > CODE_PREFIX_MAX_LENGTH or not set(code_prefix) <= set(CODE_PREFIX_CHARACTERS):
+        return False
+
+    state = 0
+    for char in body + check:
+        value = _CHAR_VALUES.get(char)
+        if value is None:
+            return False
+        state = _MUL_ALPHA[state] ^ value
+    return state == 0
+
+
+def generate_codes(count: int, prefix: Optional[str] = None, body_length: int = CODE_BODY_LENGTH) -> List[str]:
+    """批量生成带校验字符的兑换码 (可能重复，去重由调用方负责)
+
+    每批从 os.urandom 读取 数量 × 主体长度 个字节，字符映射和校验值计算都用 bytes.translate 与
+    大整数异或按列完成：Damm 校验在 GF(32) 上是线性的，校验值等于各位置贡献 α^k·c 的异或和，
+    不需要逐个字符循环。
+    """
+    prefix = normalize_prefix(prefix)
+    head = prefix + CODE_PREFIX_SEPARATOR if prefix else ""
+
+    check_table = bytes(ord(CODE_ALPHABET[v]) if v < _ALPHABET_SIZE else 0 for v in range(256))
+    # 主体第 i 个字符 (从 0 起) 对校验值的贡献为 α^(body_length - i)·c
+    position_tables = [_position_table(body_length - i) for i in range(body_length)]
+
+    codes: List[str] = []
+    remaining = count
+    while remaining > 0:
+        batch = min(remaining, CODE_URANDOM_BATCH)
+        raw = os.urandom(batch * body_length)
+        bodies = raw.translate(_BYTE_TO_CHAR).decode('ascii')
+
+        checksum = 0
+        for i, table in enumerate(position_tables):
+            checksum ^= int.from_bytes(raw[i::body_length].translate(table), 'big')
+        checks = checksum.to_bytes(batch, 'big').translate(check_table).decode('ascii')
+
+        codes.extend([
+            f"{head}{bodies[offset:offset + body_length]}{check}"
+            for offset, check in zip(range(0, batch * body_length, body_length), checks)
+        ])
+        remaining -= batch
+    return codes
+
+
+def generate_code(prefix: Optional[str] = None, body_length: int = CODE_BODY_LENGTH) -> str:
+    """生成单个带校验字符的兑换码"""
+    return generate_codes(1, prefix, body_length)[0]
+
+
+def code_space(body_length: int = CODE_BODY_LENGTH) -> int:
+    """同一前缀下可能的兑换码数量"""
+    return _ALPHABET_SIZE ** body_length
+
+
+def collision_probability(count: int, body_length: int = CODE_BODY_LENGTH, existing: int = 0) -> float:
+    """生成 count 个兑换码时至少出现一次碰撞 (批内重复或与 existing 个已有兑换码重复) 的概率
+
+    生日问题近似：1 - exp(-(n(n-1)/2 + n·m) / N)，用 expm1 保证小概率时的精度。
+    """
+    space = code_space(body_length)
+    pairs = count * (count - 1) / 2 + count * existing
+    return -math.expm1(-pairs / space)
+
+
+def expected_collisions(count: int, body_length: int = CODE_BODY_LENGTH, existing: int = 0) -> float:
+    """预计需要重新生成的兑换码数量 (批内重复与已有兑换码冲突之和)"""
+    space = code_space(body_length)
+    return (count * (count - 1) / 2 + count * existing) / space
+
+
+def guess_probability(live_codes: int, body_length: int = CODE_BODY_LENGTH) -> float:
+    """随机猜测一个格式和校验字符都正确的兑换码恰好命中有效兑换码的概率"""
+    return live_codes / code_space(body_length)
+
+
+def recommended_length(count: int, existing: int = 0, target: float = CODE_GUESS_TARGET,
+                       minimum: int = CODE_BODY_LENGTH) -> int:
+    """生成后随机猜中概率不超过 target 的最短主体长度 (不短于 minimum)"""
+    length = minimum
+    while guess_probability(count + existing, length) > target:
+        length += 1
+    return length
+
+
+def main():
+    parser = argparse.ArgumentParser(description="兑换码格式工具 (离线校验、碰撞概率估算)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("validate", help="离线校验兑换码，全部有效时退出码为 0")
+    p.add_argument("codes", nargs="+", help="兑换码")
+    p.add_argument("--prefix", help="要求的活动前缀")
+
+    p = subparsers.add_parser("odds", help="估算批量生成的碰撞概率和猜中概率")
+    p.add_argument("--count", type=int, required=True, help="生成数量")
+    p.add_argument("--existing", type=int, default=0, help="同一前缀下已有的兑换码数量")
+    p.add_argument("--length", type=int, default=CODE_BODY_LENGTH, help=f"主体长度 (默认 {CODE_BODY_LENGTH})")
+
+    p = subparsers.add_parser("generate", help="生成兑换码并输出到标准输出 (不写入数据库)")
+    p.add_argument("--count", type=int, default=1, help="生成数量")
+    p.add_argument("--prefix", help="活动前缀")
+    p.add_argument("--length", type=int, default=CODE_BODY_LENGTH, help=f"主体长度 (默认 {CODE_BODY_LENGTH})")
+
+    args = parser.parse_args()
+
+    if args.command == "validate":
+        invalid = 0
+        for code in args.codes:
+            ok = validate_code(normalize_code(code), args.prefix)
+            invalid += not ok
+            print(f"{'✅' if ok else '❌'} {code}")
+        sys.exit(1 if invalid else 0)
+
+    if args.command == "odds":
+        total = args.count + args.existing
+        print(f"🎲 主体 {args.length} 位，可能的兑换码 {code_space(args.length):,} 个")
+        print(f"   生成 {args.count:,} 个 (已有 {args.existing:,} 个) 的碰撞概率: "
+              f"{collision_probability(args.count, args.length, args.existing):.3g}，"
+              f"预计重新生成 {expected_collisions(args.count, args.length, args.existing):.3g} 个")
+        print(f"   随机猜中任一有效兑换码的概率: {guess_probability(total, args.length):.3g} / 次")
+        suggested = recommended_length(args.count, args.existing, minimum=1)
+        print(f"   猜中概率不超过 {CODE_GUESS_TARGET:g} 的最短主体长度: {suggested}")
+        return
+
+    try:
+        codes = generate_codes(args.count, args.prefix, args.length)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+    sys.stdout.write('\n'.join(codes) + '\n')
+
+
+if __name__ == "__main__":
+    main()